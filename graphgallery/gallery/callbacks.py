@@ -0,0 +1,250 @@
+import warnings
+import numpy as np
+import tensorflow as tf
+
+
+class NoOpCallbacks:
+    """A replacement of `tf.keras.callbacks.CallbackList` when
+    no callbacks are enabled, only the logs are recorded by `history`,
+    the other hooks are empty.
+    """
+
+    def __init__(self, history):
+        """
+        Parameters:
+        ----------
+        history: `tf.keras.callbacks.History` instance.
+            It records the logs of each epoch.
+        """
+        self.history = history
+        self.model = None
+
+    def set_model(self, model):
+        self.model = model
+        self.history.set_model(model)
+
+    def on_train_begin(self, logs=None):
+        self.history.on_train_begin(logs)
+
+    def on_epoch_begin(self, epoch, logs=None):
+        ...
+
+    def on_train_batch_begin(self, batch, logs=None):
+        ...
+
+    def on_train_batch_end(self, batch, logs=None):
+        ...
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.history.on_epoch_end(epoch, logs or {})
+
+    def on_train_end(self, logs=None):
+        ...
+
+
+class FastCallbackList(NoOpCallbacks):
+    """A lightweight replacement of `tf.keras.callbacks.CallbackList`
+    when only `EarlyStopping` (without `baseline`) and (or)
+    `ModelCheckpoint` are enabled.
+
+    The checks of both callbacks are inlined in `on_epoch_end`,
+    which avoids dispatching through the generic Keras callbacks
+    in every epoch, the other hooks are empty.
+    """
+
+    def __init__(self, history, es_cfg=None, ckpt_cfg=None):
+        """
+        Parameters:
+        ----------
+        history: `tf.keras.callbacks.History` instance.
+            It records the logs of each epoch.
+        es_cfg: `CfgNode`. optional
+            The configurations of `EarlyStopping`, if not specified,
+            early stopping is disabled. The `baseline` is not supported since
+            its semantics vary across Keras versions, use Keras `EarlyStopping` instead.
+        ckpt_cfg: `CfgNode`. optional
+            The configurations of `ModelCheckpoint`, if not specified,
+            model checkpoint is disabled. If `ckpt_cfg.in_memory=True`, the best
+            weights are kept in memory and restored at the end of training,
+            see `InMemoryCheckpoint` and `keep_in_memory`.
+        """
+        super().__init__(history)
+        self.es_cfg = es_cfg
+        self.ckpt_cfg = ckpt_cfg
+        self.in_memory = ckpt_cfg is not None and keep_in_memory(ckpt_cfg)
+
+    def on_train_begin(self, logs=None):
+        super().on_train_begin(logs)
+
+        es_cfg = self.es_cfg
+        if es_cfg is not None:
+            assert es_cfg.baseline is None, "`baseline` is not supported."
+            self.es_op, self.es_best = monitor_op(es_cfg.monitor, es_cfg.mode)
+            self.wait = 0
+            self.stopped_epoch = 0
+            self.best_weights = None
+
+        ckpt_cfg = self.ckpt_cfg
+        if ckpt_cfg is not None:
+            self.ckpt_op, self.ckpt_best = monitor_op(ckpt_cfg.monitor)
+            self.ckpt_weights = None
+
+    def on_epoch_end(self, epoch, logs=None):
+        logs = logs or {}
+        self.history.on_epoch_end(epoch, logs)
+        if self.es_cfg is not None:
+            self._early_stopping(epoch, logs)
+        if self.ckpt_cfg is not None:
+            self._checkpoint(epoch, logs)
+
+    def on_train_end(self, logs=None):
+        es_cfg = self.es_cfg
+        if es_cfg is not None and self.stopped_epoch > 0 and es_cfg.verbose > 0:
+            print(f"Epoch {self.stopped_epoch + 1:05d}: early stopping")
+
+        if self.in_memory and self.ckpt_weights is not None:
+            set_weights(self.model, self.ckpt_weights)
+
+    def _early_stopping(self, epoch, logs):
+        es_cfg = self.es_cfg
+        current = get_monitor_value(logs, es_cfg.monitor)
+        if current is None:
+            return
+
+        model = self.model
+        if self.es_op(current, self.es_best):
+            self.es_best = current
+            self.wait = 0
+            if es_cfg.restore_best_weights:
+                self.best_weights = get_weights(model)
+        else:
+            self.wait += 1
+            if self.wait >= es_cfg.patience:
+                self.stopped_epoch = epoch
+                model.stop_training = True
+                if es_cfg.restore_best_weights and self.best_weights is not None:
+                    if es_cfg.verbose > 0:
+                        print("Restoring model weights from the end of the best epoch.")
+                    set_weights(model, self.best_weights)
+
+    def _checkpoint(self, epoch, logs):
+        ckpt_cfg = self.ckpt_cfg
+        if not ckpt_cfg.save_best_only:
+            self._save()
+            return
+
+        current = get_monitor_value(logs, ckpt_cfg.monitor)
+        if current is None:
+            return
+
+        if self.ckpt_op(current, self.ckpt_best):
+            if ckpt_cfg.vervose > 0:
+                print(f"\nEpoch {epoch + 1:05d}: {ckpt_cfg.monitor} improved from {self.ckpt_best:.5f} "
+                      f"to {current:.5f}, saving model to {ckpt_cfg.path}")
+            self.ckpt_best = current
+            self._save()
+        elif ckpt_cfg.vervose > 0:
+            print(f"\nEpoch {epoch + 1:05d}: {ckpt_cfg.monitor} did not improve from {self.ckpt_best:.5f}")
+
+    def _save(self):
+        ckpt_cfg = self.ckpt_cfg
+        if self.in_memory:
+            self.ckpt_weights = get_weights(self.model)
+        elif ckpt_cfg.save_weights_only:
+            self.model.save_weights(ckpt_cfg.path, overwrite=True)
+        else:
+            self.model.save(ckpt_cfg.path, overwrite=True)
+
+
+class InMemoryCheckpoint(tf.keras.callbacks.Callback):
+    """Keeps the weights of the best epoch in host memory,
+    which is an alternative of `tf.keras.callbacks.ModelCheckpoint`
+    with `save_weights_only=True` but without any file I/O.
+    The best weights are restored at the end of training.
+    """
+
+    def __init__(self, monitor="val_accuracy", mode="auto",
+                 save_best_only=True, verbose=0):
+        super().__init__()
+        self.monitor = monitor
+        self.mode = mode
+        self.save_best_only = save_best_only
+        self.verbose = verbose
+        self.best_weights = None
+
+    def on_train_begin(self, logs=None):
+        self.monitor_op, self.best = monitor_op(self.monitor, self.mode)
+        self.best_weights = None
+
+    def on_epoch_end(self, epoch, logs=None):
+        if not self.save_best_only:
+            self.best_weights = get_weights(self.model)
+            return
+
+        current = get_monitor_value(logs or {}, self.monitor)
+        if current is None:
+            return
+
+        if self.monitor_op(current, self.best):
+            if self.verbose > 0:
+                print(f"\nEpoch {epoch + 1:05d}: {self.monitor} improved from {self.best:.5f} "
+                      f"to {current:.5f}, keeping weights in memory")
+            self.best = current
+            self.best_weights = get_weights(self.model)
+        elif self.verbose > 0:
+            print(f"\nEpoch {epoch + 1:05d}: {self.monitor} did not improve from {self.best:.5f}")
+
+    def on_train_end(self, logs=None):
+        if self.best_weights is not None:
+            set_weights(self.model, self.best_weights)
+
+
+def keep_in_memory(ckpt_cfg):
+    """Whether the checkpoint is kept in memory, the entire model
+    (`save_weights_only=False`) or the checkpoint to be kept on disk
+    (`remove_weights=False`) is always saved into `ckpt_cfg.path`."""
+    return ckpt_cfg.in_memory and ckpt_cfg.save_weights_only and ckpt_cfg.remove_weights
+
+
+def get_weights(model):
+    """Return a copy of the model weights in host memory."""
+    if hasattr(model, "get_weights"):
+        return model.get_weights()
+    # PyTorch
+    return {k: v.detach().to("cpu", copy=True) for k, v in model.state_dict().items()}
+
+
+def has_weights(model):
+    """Whether the model weights are built, the weights of
+    Keras models may be built lazily on the first call."""
+    if isinstance(model, tf.keras.Model):
+        return model.built
+    # PyTorch
+    return True
+
+
+def set_weights(model, weights):
+    if hasattr(model, "set_weights"):
+        model.set_weights(weights)
+    else:
+        # PyTorch
+        model.load_state_dict(weights)
+
+
+def monitor_op(monitor, mode="auto"):
+    """Return the comparison operator and the initial best value
+    of `monitor`, in the same way as Keras callbacks."""
+    if mode not in {"auto", "min", "max"}:
+        warnings.warn(f"Monitor mode '{mode}' is unknown, fallback to 'auto' mode.", RuntimeWarning)
+        mode = "auto"
+    if mode == "max" or (mode == "auto" and ("acc" in monitor or monitor.startswith("fmeasure"))):
+        return np.greater, -np.inf
+    return np.less, np.inf
+
+
+def get_monitor_value(logs, monitor):
+    value = logs.get(monitor)
+    if value is None:
+        warnings.warn(f"The metric '{monitor}' is not available, "
+                      f"available metrics are: {','.join(list(logs.keys()))}", RuntimeWarning)
+    return value
@@ -24,12 +24,39 @@ def default_cfg(model):
 
     cfg.model = gg.CfgNode()
     cfg.model.build_from_model = False
+    # compile the model after `build()` with `torch.compile`, only for PyTorch backend
+    cfg.model.compile = False
+    # compile the training and testing on each batch with XLA, only for TensorFlow backend,
+    # note that sparse ops are not supported by XLA
+    cfg.model.jit = False
 
     cfg.train = gg.CfgNode()
     cfg.train.epochs = 100
     cfg.train.verbose = 1
+    # set to "disk" to cache the batches into TFRecord files under `cache_dir`,
+    # which are removed at the end of training, only for TensorFlow backend
     cfg.train.cache_train_data = True
     cfg.train.cache_val_data = True
+    cfg.train.cache_dir = osp.join(".", "cache")
+    # cache the single batch of full-batch training data with `tf.data`,
+    # only for TensorFlow backend
+    cfg.train.cache_full_batch = False
+    # data-parallel training, currently only 'horovod' is supported,
+    # it should be specified before `build()`
+    cfg.train.distributed = None
+    # copy the host tensors of batches into pinned memory for
+    # asynchronous host-to-device copies, only for PyTorch backend with CUDA
+    cfg.train.pin_memory = False
+    # number of batches prepared in advance by the background thread,
+    # set to 0 to disable it
+    cfg.train.prefetch_depth = 2
+    # copy batches to the device in advance, only for TensorFlow backend (>=2.4)
+    # and sequences that emit host tensors, i.e., built with `device='CPU'`
+    cfg.train.prefetch_to_device = False
+    # run the whole training epoch in a single `tf.function`, only for TensorFlow backend (>=2.4)
+    # note that the batches are fed through `tf.data` on the host, so it only
+    # applies to multi-batch sequences that emit host tensors (`device='CPU'`)
+    cfg.train.fuse_epoch = False
 
     cfg.train.EarlyStopping = gg.CfgNode()
     cfg.train.EarlyStopping.enabled = False
@@ -52,6 +79,10 @@ def default_cfg(model):
     cfg.train.ModelCheckpoint.save_best_only = True
     cfg.train.ModelCheckpoint.save_weights_only = True
     cfg.train.ModelCheckpoint.vervose = 0
+    # keep the best weights in memory instead of saving them into `path`,
+    # only works with `save_weights_only=True` and `remove_weights=True`,
+    # otherwise it is ignored
+    cfg.train.ModelCheckpoint.in_memory = True
 
     cfg.train.Progbar = gg.CfgNode()
     cfg.train.Progbar.width = 20
@@ -70,10 +101,21 @@ def default_cfg(model):
     cfg.test = gg.CfgNode()
     cfg.test.verbose = 1
     cfg.test.cache_test_data = True
+    cfg.test.prefetch_depth = 2
+    # see `cfg.train.prefetch_to_device`
+    cfg.test.prefetch_to_device = False
 
     cfg.test.Progbar = gg.CfgNode()
     cfg.test.Progbar.width = 20
 
     cfg.predict = gg.CfgNode()
     cfg.predict.return_logits = True
+    # compute softmax on the device along with the model
+    # instead of on the host, used when `return_logits=False`
+    cfg.predict.fused_softmax = True
+    # data type of the predictions, e.g., 'float16' or 'bfloat16',
+    # which halves the memory footprint. Note that 'bfloat16' is
+    # not supported for PyTorch backend since Numpy lacks it.
+    # (default: :obj:`None`, the output type of the model)
+    cfg.predict.logits_dtype = None
     return cfg
@@ -0,0 +1,71 @@
+"""Helpers of data-parallel training with Horovod <https://github.com/horovod/horovod>.
+
+Horovod is an optional dependency, it is imported only when
+`cfg.train.distributed='horovod'` is used.
+"""
+
+
+def init_horovod(backend):
+    """Import and initialize Horovod for the backend,
+    returns the Horovod module."""
+    if backend == "tensorflow":
+        import horovod.tensorflow.keras as hvd
+    else:
+        import horovod.torch as hvd
+    hvd.init()
+    return hvd
+
+
+def distribute_model(model, backend):
+    """Average the gradients of the model across workers with ring-allreduce.
+
+    For TensorFlow, the gradient tape of `TFKeras.train_step_on_batch` is
+    wrapped with `DistributedGradientTape`, since the gradients are applied
+    with `optimizer.apply_gradients` directly, which does not aggregate
+    the gradients of a `DistributedOptimizer` in old TensorFlow versions.
+    For PyTorch, the optimizer of the model is wrapped with `DistributedOptimizer`.
+    """
+    init_horovod(backend)
+    if backend == "tensorflow":
+        import horovod.tensorflow as hvd
+        model._tape_wrapper = hvd.DistributedGradientTape
+    else:
+        import horovod.torch as hvd
+        model.optimizer = hvd.DistributedOptimizer(model.optimizer,
+                                                   named_parameters=model.named_parameters())
+
+
+def broadcast_variables(model, backend, root_rank=0):
+    """Broadcast the model and optimizer states from `root_rank`
+    to the other workers. The optimizer states are created lazily,
+    so it should be called after the first training batch, like
+    `BroadcastGlobalVariablesCallback` of Horovod."""
+    if backend == "tensorflow":
+        import horovod.tensorflow as hvd
+        hvd.broadcast_variables(model.variables, root_rank=root_rank)
+        hvd.broadcast_variables(model.optimizer.variables(), root_rank=root_rank)
+    else:
+        import horovod.torch as hvd
+        hvd.broadcast_parameters(model.state_dict(), root_rank=root_rank)
+        hvd.broadcast_optimizer_state(model.optimizer, root_rank=root_rank)
+
+
+def worker_cfg(cfg, in_memory):
+    """Return a copy of the training `cfg` for the non-root workers,
+    which do not write files or print logs. The shared `cfg` is left intact.
+
+    Parameters:
+    ----------
+    cfg: `CfgNode`.
+        The training configurations, i.e., `trainer.cfg.train`.
+    in_memory: bool.
+        Whether the checkpoint is kept in memory, which is still restored
+        on every worker so that all the workers end up with the same model.
+    """
+    cfg = cfg.clone()
+    cfg.verbose = 0
+    cfg.EarlyStopping.verbose = 0
+    cfg.ModelCheckpoint.vervose = 0
+    cfg.TensorBoard.enabled = False
+    cfg.ModelCheckpoint.enabled = cfg.ModelCheckpoint.enabled and in_memory
+    return cfg
@@ -1,5 +1,7 @@
 import os
 import sys
+import glob
+import uuid
 import warnings
 import inspect
 import os.path as osp
@@ -18,8 +20,15 @@ from graphgallery.nn.functions import softmax
 from graphgallery.data.io import makedirs_from_filepath
 from graphgallery.utils.raise_error import raise_if_kwargs
 from graphgallery.gallery import Model
+from graphgallery.sequence.tf_dataset import is_gpu
+from graphgallery.sequence import (unravel_batch, PrefetchIterator, TFRecordSequence,
+                                   CachedFullBatchSequence, ShardedSequence, sequence_to_tf_dataset,
+                                   FullBatchSequence, PinMemorySequence)
 
 from .default import default_cfg
+from .callbacks import (NoOpCallbacks, FastCallbackList, InMemoryCheckpoint,
+                        keep_in_memory, get_weights, has_weights, set_weights)
+from .distributed import init_horovod, distribute_model, broadcast_variables, worker_cfg
 
 # TensorFlow 2.1.x
 # Ignora warnings:
@@ -56,20 +65,13 @@ warnings.filterwarnings(
 #     return format_doc(d)
 
 
-def unravel_batch(batch):
-    inputs = labels = out_weight = None
-    if isinstance(batch, (list, tuple)):
-        inputs = batch[0]
-        labels = batch[1]
-        if len(batch) > 2:
-            out_weight = batch[-1]
-    else:
-        inputs = batch
-    return inputs, labels, out_weight
-
-
 class Trainer(Model):
     is_processed = False
+    backup = None
+    _pending_backup = False
+    _metric_states = None
+    _fused_train_epoch = None
+    _pending_broadcast = False
 
     def custom_setup(self):
         pass
@@ -131,14 +133,26 @@ class Trainer(Model):
             whether to use bias in each layer.
         use_tfn: bool,
             this argument is only used for TensorFlow backend, if `True`, it will decorate
-            the model training and testing with `tf.function` (See `graphgallery.nn.modes.TFKeras`).
+            the model training, testing and predicting on each batch with `tf.function`
+            (See `graphgallery.nn.models.TFKeras.use_tfn`).
             By default, it was `True`, which can accelerate the training and inference, by it may cause
-            several errors.
+            several errors. Note that the Python loop over batches is still executed eagerly,
+            set `cfg.train.fuse_epoch=True` to run the whole training epoch in a single `tf.function`.
+        compile: bool,
+            this argument is only used for PyTorch backend, if `True`, the forward pass
+            of the model will be compiled with `torch.compile` (See `cfg.model.compile`).
+        jit: bool,
+            this argument is only used for TensorFlow backend, if `True`, the model training
+            and testing on each batch will be compiled with XLA (See `cfg.model.jit`).
         other arguments (if have) will be passed into your method 'builder'.
         """
         if not self.is_processed:
             raise RuntimeError("Please call 'trainer.process()' first.")
 
+        # not the arguments of 'builder'
+        self.cfg.model.compile = kwargs.pop("compile", self.cfg.model.compile)
+        self.cfg.model.jit = kwargs.pop("jit", self.cfg.model.jit)
+
         if self.backend == "tensorflow":
             with tf.device(self.device):
                 self.model, kwargs = gf.wrapper(self.builder)(**kwargs)
@@ -146,6 +160,10 @@ class Trainer(Model):
             model, kwargs = gf.wrapper(self.builder)(**kwargs)
             self.model = model.to(self.device)
         self.cfg.model.merge_from_dict(kwargs)
+
+        if self.cfg.train.distributed == "horovod":
+            distribute_model(self.model, self.backend)
+        self.specialize()
         return self
 
     def build_from_model(self, model):
@@ -158,9 +176,25 @@ class Trainer(Model):
         else:
             self.model = model.to(self.device)
 
+        if self.cfg.train.distributed == "horovod":
+            distribute_model(self.model, self.backend)
+        self.specialize()
+
         self.cfg.model.build_from_model = False
         return self
 
+    def specialize(self):
+        """Compile the model once after building it,
+        according to `cfg.model.compile` and `cfg.model.jit`."""
+        cfg = self.cfg.model
+        model = self.model
+        if self.backend == "torch":
+            if cfg.compile and hasattr(model, "use_compile"):
+                model.use_compile()
+        elif cfg.jit and hasattr(model, "use_xla"):
+            with tf.device(self.device):
+                model.use_xla()
+
     def builder(self, *args, **kwargs):
         raise NotImplementedError
 
@@ -171,6 +205,7 @@ class Trainer(Model):
         ckpt_cfg = cfg.ModelCheckpoint
         es_cfg = cfg.EarlyStopping
         pb_cfg = cfg.Progbar
+        in_memory = keep_in_memory(ckpt_cfg)
 
         model = self.model
         if model is None:
@@ -178,9 +213,40 @@ class Trainer(Model):
                 'You must compile your model before training/testing/predicting. Use `trainer.build()`.'
             )
 
+        if self._pending_backup and has_weights(model):
+            self.snapshot_weights()
+        # the lazily built weights would be trained, nothing to back up
+        self._pending_backup = False
+
         if not isinstance(train_data, Sequence):
             train_data = self.train_sequence(train_data)
 
+        rank = 0
+        distributed = cfg.distributed == "horovod"
+        # the variables are broadcast after the first batch, see `train_step`
+        self._pending_broadcast = distributed
+        if distributed:
+            hvd = init_horovod(self.backend)
+            rank = hvd.rank()
+            if len(train_data) >= hvd.size() > 1:
+                train_data = ShardedSequence(train_data, hvd.size(), hvd.rank())
+            if rank != 0:
+                # only the root worker writes files and prints logs
+                cfg = worker_cfg(cfg, in_memory)
+                ckpt_cfg = cfg.ModelCheckpoint
+                es_cfg = cfg.EarlyStopping
+
+        if cfg.cache_train_data == "disk":
+            train_data = self.disk_cached(train_data, "train", rank)
+        elif cfg.cache_full_batch and self.backend == "tensorflow" and len(train_data) == 1:
+            # the batch of `FullBatchSequence` is already on the device
+            if not isinstance(train_data, (CachedFullBatchSequence, FullBatchSequence)):
+                train_data = CachedFullBatchSequence(train_data)
+
+        pin_memory = cfg.pin_memory and self.backend == "torch" and self.device.type == "cuda"
+        if pin_memory:
+            train_data = self.pinned(train_data)
+
         if cfg.cache_train_data:
             cache.train_data = train_data
 
@@ -188,14 +254,16 @@ class Trainer(Model):
         if validation:
             if not isinstance(val_data, Sequence):
                 val_data = self.test_sequence(val_data)
+            if cfg.cache_val_data == "disk":
+                val_data = self.disk_cached(val_data, "val", rank)
+            if pin_memory:
+                val_data = self.pinned(val_data)
             if cfg.cache_val_data:
                 cache.val_data = val_data
 
         # Setup callbacks
-        callbacks = callbacks_module.CallbackList()
         history = History()
-        callbacks.append(history)
-        cfg, callbacks = setup_callbacks(cfg, callbacks, validation)
+        cfg, callbacks = setup_callbacks(cfg, history, validation)
         callbacks.set_model(model)
         model.stop_training = False
 
@@ -219,13 +287,18 @@ class Trainer(Model):
                 callbacks.on_epoch_begin(epoch)
                 callbacks.on_train_batch_begin(0)
                 train_logs = self.train_step(train_data)
-                train_data.on_epoch_end()
+                if getattr(train_data, "stateful", True):
+                    train_data.on_epoch_end()
                 logs.update(train_logs)
 
                 if validation:
                     valid_logs = self.test_step(val_data)
                     logs.update({("val_" + k): v for k, v in valid_logs.items()})
-                    val_data.on_epoch_end()
+                    if getattr(val_data, "stateful", True):
+                        val_data.on_epoch_end()
+
+                # pull all the metrics to the host at once
+                logs.update(logs_to_scalars(logs, self.backend))
 
                 callbacks.on_train_batch_end(len(train_data), logs)
                 callbacks.on_epoch_end(epoch, logs)
@@ -240,17 +313,24 @@ class Trainer(Model):
                     print(f"Early Stopping at Epoch {epoch}", file=sys.stderr)
                     break
 
+            # the best weights in memory are restored by callbacks
             callbacks.on_train_end()
-            if ckpt_cfg.enabled:
+            if ckpt_cfg.enabled and not in_memory:
                 if ckpt_cfg.save_weights_only:
                     model.load_weights(ckpt_cfg.path)
                 else:
                     self.model = model.load(ckpt_cfg.path)
+                    # the compilation is not saved with the model
+                    self.specialize()
 
         finally:
             # to avoid unexpected termination of the model
-            if ckpt_cfg.enabled and ckpt_cfg.remove_weights:
+            if ckpt_cfg.enabled and ckpt_cfg.remove_weights and not in_memory:
                 self.remove_weights()
+            # including the caches reused from `trainer.cache`
+            for sequence in (train_data, val_data):
+                if getattr(sequence, "temporary", False):
+                    sequence.remove()
 
         return history
 
@@ -279,37 +359,105 @@ class Trainer(Model):
         progbar = Progbar(target=len(test_data),
                           width=cfg.Progbar.width,
                           verbose=cfg.verbose)
-        logs = gf.BunchDict(**self.test_step(test_data))
-        logs.update({k: v.numpy().item() for k, v in logs.items()})
+        logs = gf.BunchDict(**logs_to_scalars(self.test_step(test_data), self.backend))
         progbar.update(len(test_data), logs.items())
         return logs
 
     def train_step(self, sequence):
         model = self.model
-        model.reset_metrics()
+        self.reset_metrics()
+        cfg = self.cfg.train
+        device = sequence.device
+
+        # the first epoch of distributed training is not fused, since the
+        # variables are broadcast after the first batch. Single-batch and
+        # device-resident sequences are not fused either, since there is
+        # nothing to save and the batches would be copied through the host.
+        if (cfg.fuse_epoch and self.backend == "tensorflow" and not self._pending_broadcast
+                and len(sequence) > 1 and not is_gpu(device)):
+            return self._train_epoch(self._tf_dataset(sequence), device)
 
+        kwargs = dict(non_blocking=True) if getattr(sequence, "pin_memory", False) else {}
         results = None
-        for batch in sequence:
-            inputs, labels, out_weight = unravel_batch(batch)
+        for inputs, labels, out_weight in self._iter_batches(sequence, cfg):
             results = model.train_step_on_batch(x=inputs,
                                                 y=labels,
                                                 out_weight=out_weight,
-                                                device=sequence.device)
+                                                device=device,
+                                                **kwargs)
+            if self._pending_broadcast:
+                # the optimizer states are created in the first batch
+                broadcast_variables(model, self.backend)
+                self._pending_broadcast = False
         return results
 
     def test_step(self, sequence):
         model = self.model
-        model.reset_metrics()
+        self.reset_metrics()
+        cfg = self.cfg.test
+        device = sequence.device
 
+        kwargs = dict(non_blocking=True) if getattr(sequence, "pin_memory", False) else {}
         results = None
-        for batch in sequence:
-            inputs, labels, out_weight = unravel_batch(batch)
+        for inputs, labels, out_weight in self._iter_batches(sequence, cfg):
             results = model.test_step_on_batch(x=inputs,
                                                y=labels,
                                                out_weight=out_weight,
-                                               device=sequence.device)
+                                               device=device,
+                                               **kwargs)
         return results
 
+    def _train_epoch(self, dataset, device):
+        fused_train_epoch = self._fused_train_epoch
+        if fused_train_epoch is None:
+            # the traced graph captures the model, so a new `tf.function`
+            # is built for each model, it is reset by the `model` setter
+            model = self.model
+
+            def fused_train_epoch(dataset, device):
+                return train_epoch(model, dataset, device)
+
+            fused_train_epoch = tf.function(fused_train_epoch, experimental_relax_shapes=True)
+            self._fused_train_epoch = fused_train_epoch
+        return fused_train_epoch(dataset, device)
+
+    def _iter_batches(self, sequence, cfg):
+        # the batches of sequences on the device need no copy
+        if cfg.prefetch_to_device and self.backend == "tensorflow" and not is_gpu(sequence.device):
+            return map(unravel_batch, self._tf_dataset(sequence))
+        if not cfg.prefetch_depth or len(sequence) == 1:
+            # nothing to overlap, e.g., full-batch sequences
+            return map(getattr(sequence, "unravel", unravel_batch), sequence)
+        return PrefetchIterator(sequence, cfg.prefetch_depth)
+
+    def _tf_dataset(self, sequence):
+        # the dataset is built only once for each sequence
+        dataset = getattr(sequence, "_tf_dataset", None)
+        if dataset is None:
+            dataset = sequence_to_tf_dataset(sequence, self.device)
+            sequence._tf_dataset = dataset
+        return dataset
+
+    def pinned(self, sequence):
+        """Wrap `sequence` with `PinMemorySequence`, the batches of
+        full-batch sequences are pinned only once."""
+        if isinstance(sequence, PinMemorySequence):
+            return sequence
+        return PinMemorySequence(sequence,
+                                 cache=isinstance(sequence, FullBatchSequence),
+                                 device=self.device)
+
+    def disk_cached(self, sequence, name, rank=0):
+        if isinstance(sequence, TFRecordSequence):
+            return sequence
+        if self.backend != "tensorflow":
+            raise RuntimeError("Caching data on disk is only supported for TensorFlow backend.")
+        # use `uuid` and `rank` to avoid duplication with
+        # other trainers and workers
+        path = osp.join(self.cfg.train.cache_dir,
+                        f"{self.name}_{name}_{uuid.uuid1().hex[:6]}_rank{rank}.tfrecord")
+        return TFRecordSequence(sequence, path, temporary=True)
+
     def predict(self, predict_data=None, return_logits=True):
 
         if not self.model:
@@ -324,30 +472,61 @@ class Trainer(Model):
         if predict_data is None:
             predict_data = np.arange(self.graph.num_nodes)
 
+        num_samples = None
         if not isinstance(predict_data, Sequence):
             predict_data = gf.asarray(predict_data)
+            num_samples = np.size(predict_data)
             predict_data = self.predict_sequence(predict_data)
 
         cache.predict_data = predict_data
 
-        logits = self.predict_step(predict_data)
+        logits = self.predict_step(predict_data, num_samples)
 
-        if not return_logits:
+        if not (return_logits or cfg.fused_softmax):
             logits = softmax(logits)
 
         return logits.squeeze()
 
-    def predict_step(self, sequence):
-        logits = []
+    def predict_step(self, sequence, num_samples=None):
         model = self.model
+        cfg = self.cfg.predict
+        # the softmax is fused into the model if `fused_softmax=True`
+        return_logits = cfg.return_logits or not cfg.fused_softmax
+        if cfg.logits_dtype == "bfloat16" and self.backend == "torch":
+            # the predictions are returned as Numpy arrays
+            raise ValueError("`logits_dtype='bfloat16'` is not supported for PyTorch backend "
+                             "since Numpy lacks it, use 'float16' instead.")
+        unravel = getattr(sequence, "unravel", unravel_batch)
+        device = sequence.device
+        logits = None
+        offset = 0
         for batch in sequence:
-            inputs, labels, out_weight = unravel_batch(batch)
+            inputs, labels, out_weight = unravel(batch)
             logit = model.predict_step_on_batch(x=inputs,
                                                 out_weight=out_weight,
-                                                device=sequence.device)
-            logits.append(logit)
-
-        return np.vstack(logits)
+                                                return_logits=return_logits,
+                                                device=device,
+                                                dtype=cfg.logits_dtype)
+            logit = np.asarray(logit)
+            end = offset + logit.shape[0]
+            if logits is None:
+                # preallocate the output buffer and fill it in-place,
+                # which avoids stacking all the batches at last
+                logits = np.empty((max(num_samples or 0, end),) + logit.shape[1:],
+                                  dtype=logit.dtype)
+            elif end > logits.shape[0]:
+                # `num_samples` is unknown or mismatched, grow the buffer
+                buffer = np.empty((max(end, 2 * logits.shape[0]),) + logits.shape[1:],
+                                  dtype=logits.dtype)
+                buffer[:offset] = logits[:offset]
+                logits = buffer
+            logits[offset:end] = logit
+            offset = end
+
+        if offset < logits.shape[0]:
+            # copy it, otherwise the view keeps the oversized buffer alive
+            logits = logits[:offset].copy()
+        return logits
 
     def train_sequence(self, inputs, **kwargs):
         raise NotImplementedError
@@ -364,17 +543,25 @@ class Trainer(Model):
         labels = self.graph.node_label[index]
         return (predict_class == labels).mean()
 
+    def snapshot_weights(self):
+        """store the current weights of the model in host memory,
+        which would be restored by `reset_weights`."""
+        self.backup = get_weights(self.model)
+        self._pending_backup = False
+
     def reset_weights(self):
-        # TODO: add pytorch support
         """reset the model to the first time."""
         model = self.model
+        if self._pending_backup and has_weights(model):
+            # the model has not been trained yet
+            self.snapshot_weights()
         if self.backup is None:
             raise RuntimeError(
                 "You must store the `backup` before `reset_weights`."
-                "`backup` will be automatically stored when the model is built."
+                "`backup` will be automatically stored before the model is trained, "
+                "or call `trainer.snapshot_weights()` manually."
             )
-        for w, wb in zip(model.weights, self.backup):
-            w.assign(wb)
+        set_weights(model, self.backup)
 
     @property
     def model(self):
@@ -382,12 +569,32 @@ class Trainer(Model):
 
     @model.setter
     def model(self, m):
-        # Back up
-        if isinstance(m, tf.keras.Model) and m.weights:
-            self.backup = tf.identity_n(m.weights)
+        # Back up lazily, the weights are copied to host memory
+        # by `snapshot_weights` before the model is trained
+        self.backup = None
+        self._pending_backup = m is not None
+        self._metric_states = None
+        self._fused_train_epoch = None
         # TODO assert m is None or isinstance(m, tf.keras.Model) or torch.nn.Module
         self._model = m
 
+    def reset_metrics(self):
+        """reset the states of the model metrics."""
+        metric_states = self._metric_states
+        if metric_states is None:
+            model = self.model
+            model.reset_metrics()
+            # NOTE: for tensorflow>=2.2.0, the metrics are built after the first step
+            if isinstance(model, tf.keras.Model) and model.metrics:
+                # cache the metric variables and zero them in place,
+                # which avoids collecting the metrics from all layers each time
+                self._metric_states = [(v, tf.zeros_like(v))
+                                       for metric in model.metrics
+                                       for v in metric.variables]
+        else:
+            for v, zero in metric_states:
+                v.assign(zero)
+
     def reset_optimizer(self):
         # TODO: add pytorch support
         model = self.model
@@ -422,22 +629,53 @@ class Trainer(Model):
 #             )
 
 
+def logs_to_scalars(logs, backend):
+    """Convert the (tensor) values of logs into Python scalars,
+    all the values are copied to the host at once."""
+    if not logs:
+        return dict(logs)
+    values = list(logs.values())
+    if backend == "tensorflow":
+        values = tf.stack([tf.cast(v, tf.float32) for v in values]).numpy().tolist()
+    else:
+        # values of PyTorch backend are already on the host
+        values = [float(v) for v in values]
+    return dict(zip(logs.keys(), values))
+
+
+def train_epoch(model, dataset, device):
+    """Train the model over all the batches of `dataset`,
+    which should be wrapped with `tf.function`."""
+    iterator = iter(dataset)
+    # the first batch is unrolled so that `results` is
+    # defined before the loop, as required by AutoGraph
+    inputs, labels, out_weight = unravel_batch(next(iterator))
+    results = model.train_step_on_batch(x=inputs,
+                                        y=labels,
+                                        out_weight=out_weight,
+                                        device=device)
+    for batch in iterator:
+        inputs, labels, out_weight = unravel_batch(batch)
+        results = model.train_step_on_batch(x=inputs,
+                                            y=labels,
+                                            out_weight=out_weight,
+                                            device=device)
+    return results
+
+
 def remove_extra_tf_files(filepath):
     # for tensorflow weights that saved without h5 formate
-    for ext in (".data-00000-of-00001", ".data-00000-of-00002",
-                ".data-00001-of-00002", ".index"):
-        path = filepath + ext
-        if osp.exists(path):
-            os.remove(path)
-
     file_dir = osp.split(osp.realpath(filepath))[0]
-
-    path = osp.join(file_dir, "checkpoint")
-    if osp.exists(path):
-        os.remove(path)
+    paths = glob.glob(glob.escape(filepath) + ".data-*-of-*")
+    paths += [filepath + ".index", osp.join(file_dir, "checkpoint")]
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
 
 
-def setup_callbacks(cfg, callbacks, validation):
+def setup_callbacks(cfg, history, validation):
     ckpt_cfg = cfg.ModelCheckpoint
     es_cfg = cfg.EarlyStopping
     tb_cfg = cfg.TensorBoard
@@ -452,6 +690,27 @@ def setup_callbacks(cfg, callbacks, validation):
             warnings.warn(f"The metric 'val_{es_cfg.monitor}' is invalid without validation "
                           f"and has been automatically replaced with '{es_cfg.monitor}'.", UserWarning)
 
+    in_memory = keep_in_memory(ckpt_cfg)
+    if ckpt_cfg.enabled and not in_memory:
+        if not ckpt_cfg.path.endswith(gg.file_ext()):
+            ckpt_cfg.path += gg.file_ext()
+        makedirs_from_filepath(ckpt_cfg.path)
+
+    if not (es_cfg.enabled or ckpt_cfg.enabled or cfg.TerminateOnNaN.enabled or tb_cfg.enabled):
+        # only `history` is needed
+        return cfg, NoOpCallbacks(history)
+
+    if not (cfg.TerminateOnNaN.enabled or tb_cfg.enabled or
+            (es_cfg.enabled and es_cfg.baseline is not None)):
+        # inline the checks of `EarlyStopping` and `ModelCheckpoint`
+        callbacks = FastCallbackList(history,
+                                     es_cfg=es_cfg if es_cfg.enabled else None,
+                                     ckpt_cfg=ckpt_cfg if ckpt_cfg.enabled else None)
+        return cfg, callbacks
+
+    callbacks = callbacks_module.CallbackList()
+    callbacks.append(history)
+
     if es_cfg.enabled:
         es_callback = EarlyStopping(monitor=es_cfg.monitor,
                                     patience=es_cfg.patience,
@@ -461,10 +720,11 @@ def setup_callbacks(cfg, callbacks, validation):
                                     restore_best_weights=es_cfg.restore_best_weights)
         callbacks.append(es_callback)
 
-    if ckpt_cfg.enabled:
-        if not ckpt_cfg.path.endswith(gg.file_ext()):
-            ckpt_cfg.path += gg.file_ext()
-        makedirs_from_filepath(ckpt_cfg.path)
+    if ckpt_cfg.enabled and in_memory:
+        callbacks.append(InMemoryCheckpoint(monitor=ckpt_cfg.monitor,
+                                            save_best_only=ckpt_cfg.save_best_only,
+                                            verbose=ckpt_cfg.vervose))
+    elif ckpt_cfg.enabled:
         mc_callback = ModelCheckpoint(ckpt_cfg.path,
                                       monitor=ckpt_cfg.monitor,
                                       save_best_only=ckpt_cfg.save_best_only,
@@ -14,7 +14,12 @@ def softmax(x: np.ndarray, axis: int = -1) -> np.ndarray:
     Returns
     -------
     softmax_along_axis: np.ndarray
-        An array with the same shape as `x`.
+        An array with the same shape as `x`,
+        which is computed in at least `float32` precision.
     """
+    x = np.asarray(x)
+    if x.dtype.itemsize < 4:
+        # upcast half precision inputs, e.g., 'float16' and 'bfloat16'
+        x = x.astype(np.float32)
     exp_x = np.exp(x - np.max(x))
     return exp_x / exp_x.sum(axis=axis, keepdims=True)
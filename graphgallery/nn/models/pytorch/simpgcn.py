@@ -5,6 +5,7 @@ import torch.nn as nn
 from torch import optim
 
 from graphgallery.nn.models import TorchKeras
+from graphgallery.nn.models.torch_keras import to_device
 from graphgallery.nn.layers.pytorch import GraphConvolution, activations
 from graphgallery.nn.metrics.pytorch import Accuracy
 from graphgallery.nn.init.pytorch import glorot_uniform, zeros
@@ -130,7 +131,10 @@ class SimPGCN(TorchKeras):
                             x,
                             y=None,
                             out_weight=None,
-                            device="cpu"):
+                            device="cpu",
+                            non_blocking=False):
+        if non_blocking:
+            x, y, out_weight = to_device((x, y, out_weight), device, non_blocking=True)
         self.train()
         optimizer = self.optimizer
         loss_fn = self.loss
@@ -1,3 +1,4 @@
+import types
 import warnings
 import tensorflow as tf
 from tensorflow.keras import Model
@@ -17,11 +18,18 @@ else:
     METRICS = "metrics"
     LOSS = "loss"
 
+if LooseVersion(tf.__version__) >= LooseVersion("2.5.0"):
+    JIT_COMPILE = "jit_compile"
+else:
+    JIT_COMPILE = "experimental_compile"
+
 
 class TFKeras(Model):
     """High-level encapsulation of Tensorflow Keras Model."""
     _use_tfn = False
     _custom_objects = None
+    # wraps the gradient tape, e.g., `horovod.tensorflow.DistributedGradientTape`
+    _tape_wrapper = None
 
     def use_tfn(self):
         assert not self._use_tfn, "'tf.function' has been used."
@@ -33,6 +41,18 @@ class TFKeras(Model):
             self.predict_step_on_batch, experimental_relax_shapes=True)
         self._use_tfn = True
 
+    def use_xla(self):
+        """Compile the model training and testing on each batch with XLA,
+        the kernels are specialized to the (fixed) input shapes.
+        All the ops must be supported by XLA, e.g., sparse ops are not.
+        """
+        cls = type(self)
+        # wrap the original methods, even if `use_tfn` has been called
+        self.train_step_on_batch = tf.function(
+            types.MethodType(cls.train_step_on_batch, self), **{JIT_COMPILE: True})
+        self.test_step_on_batch = tf.function(
+            types.MethodType(cls.test_step_on_batch, self), **{JIT_COMPILE: True})
+
     def train_step_on_batch(self, x, y=None, out_weight=None, device="CPU"):
         # FIXME: self.metrics would return '[]' for tensorflow>=2.2.0
         # See <https://github.com/tensorflow/tensorflow/issues/37990>
@@ -53,6 +73,8 @@ class TFKeras(Model):
                 else:
                     metrics.update_state(y, out)
 
+            if self._tape_wrapper is not None:
+                tape = self._tape_wrapper(tape)
             grad = tape.gradient(loss, self.trainable_variables)
             optimizer.apply_gradients(zip(grad, self.trainable_variables))
 
@@ -86,12 +108,16 @@ class TFKeras(Model):
                               x,
                               out_weight=None,
                               return_logits=True,
-                              device="CPU"):
+                              device="CPU",
+                              dtype=None):
         with tf.device(device):
             out = self(x, training=False)
             out = gather(out, out_weight)
             if not return_logits:
                 out = softmax(out)
+            if dtype is not None:
+                # cast on the device to reduce the bytes copied to the host
+                out = tf.cast(out, dtype)
         return out
 
     def save_weights(self,
@@ -1,3 +1,4 @@
+import warnings
 import torch
 import torch.nn as nn
 import os.path as osp
@@ -52,11 +53,30 @@ class TorchKeras(nn.Module):
     def empty_cache(self):
         self.cache = gf.BunchDict()
 
+    def use_compile(self, **kwargs):
+        """Compile the forward pass with `torch.compile` (PyTorch>=2.0),
+        the kernels are specialized to the (fixed) input shapes.
+        Only `forward` is compiled so that the other methods,
+        e.g., `train_step_on_batch`, are still available.
+        The compiled `forward` is not pickled, i.e., the model is
+        saved (`save`) without compilation.
+        """
+        if not hasattr(torch, "compile"):
+            warnings.warn("`torch.compile` requires PyTorch>=2.0, "
+                          f"got {torch.__version__}.", RuntimeWarning)
+            return
+        kwargs.setdefault("dynamic", False)
+        self.forward = torch.compile(self.forward, **kwargs)
+
     def train_step_on_batch(self,
                             x,
                             y=None,
                             out_weight=None,
-                            device="cpu"):
+                            device="cpu",
+                            non_blocking=False):
+        if non_blocking:
+            # asynchronous copies from pinned memory
+            x, y, out_weight = to_device((x, y, out_weight), device, non_blocking=True)
         self.train()
         optimizer = self.optimizer
         loss_fn = self.loss
@@ -79,7 +99,11 @@ class TorchKeras(nn.Module):
                            x,
                            y=None,
                            out_weight=None,
-                           device="cpu"):
+                           device="cpu",
+                           non_blocking=False):
+        if non_blocking:
+            # asynchronous copies from pinned memory
+            x, y, out_weight = to_device((x, y, out_weight), device, non_blocking=True)
         self.eval()
         loss_fn = self.loss
         metrics = self.metrics
@@ -95,11 +119,19 @@ class TorchKeras(nn.Module):
         return dict(zip(self.metrics_names, results))
 
     @torch.no_grad()
-    def predict_step_on_batch(self, x, out_weight=None, device="cpu"):
+    def predict_step_on_batch(self, x, out_weight=None,
+                              return_logits=True,
+                              device="cpu",
+                              dtype=None):
         self.eval()
         out = self(*x if isinstance(x, (list, tuple)) else [x])
         if out_weight is not None:
             out = out[out_weight]
+        if not return_logits:
+            out = out.softmax(dim=-1)
+        if dtype is not None:
+            # cast on the device to reduce the bytes copied to the host
+            out = out.to(getattr(torch, dtype))
         return out.cpu().detach()
 
     def build(self, inputs):
@@ -175,6 +207,12 @@ class TorchKeras(nn.Module):
 
         return torch.load(filepath)
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # drop the compiled `forward` of `use_compile`, which could not be pickled
+        state.pop("forward", None)
+        return state
+
     def reset_parameters(self):
         for layer in self.layers:
             layer.reset_parameters()
@@ -182,3 +220,15 @@ class TorchKeras(nn.Module):
 
 def dummy_function(*args, **kwargs):
     ...
+
+
+def to_device(x, device, non_blocking=False):
+    """Copy the (nested) tensors in `x` to `device`,
+    the other objects are returned as they are."""
+    if torch.is_tensor(x):
+        return x.to(device, non_blocking=non_blocking)
+    if isinstance(x, (list, tuple)):
+        out = (to_device(xi, device, non_blocking=non_blocking) for xi in x)
+        # namedtuples, e.g., `graphgallery.sequence.BatchDict`
+        return type(x)(*out) if hasattr(x, "_fields") else type(x)(out)
+    return x
@@ -3,3 +3,8 @@ from .minibatch_sequence import MiniBatchSequence, SAGEMiniBatchSequence, FastGC
 from .fullbatch_sequence import FullBatchSequence
 from .sample_sequence import SBVATSampleSequence
 from .null_sequence import NullSequence
+from .utils import BatchDict, unravel_batch, unravel_one, unravel_two, unravel_three, PrefetchIterator
+from .tf_dataset import sequence_to_tf_dataset, CachedFullBatchSequence
+from .tfrecord_sequence import TFRecordSequence
+from .sharded_sequence import ShardedSequence
+from .pin_memory_sequence import PinMemorySequence
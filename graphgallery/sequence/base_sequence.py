@@ -7,9 +7,16 @@ from torch.nn import Module
 from functools import partial
 
 from graphgallery import functional as gf
+from .utils import unravel_batch
 
 
 class Sequence(tf_Sequence):
+    # unpack a batch into `(inputs, labels, out_weight)`,
+    # subclasses with fixed batch structure could specialize it
+    unravel = staticmethod(unravel_batch)
+    # whether `on_epoch_end` changes the batches, e.g., shuffling,
+    # it is skipped by the trainer for stateless sequences
+    stateful = True
 
     def __init__(self, *args, **kwargs):
         device = kwargs.pop('device', 'cpu')
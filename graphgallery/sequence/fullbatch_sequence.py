@@ -1,7 +1,10 @@
 from .base_sequence import Sequence
+from .utils import BatchDict, unravel_three
 
 
 class FullBatchSequence(Sequence):
+    unravel = staticmethod(unravel_three)
+    stateful = False
 
     def __init__(self, x, y=None, out_weight=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -14,7 +17,7 @@ class FullBatchSequence(Sequence):
         return 1
 
     def __getitem__(self, index):
-        return self.x, self.y, self.out_weight
+        return BatchDict(self.x, self.y, self.out_weight)
 
     def on_epoch_begin(self):
         ...
@@ -4,9 +4,11 @@ import tensorflow as tf
 import scipy.sparse as sp
 
 from .base_sequence import Sequence
+from .utils import BatchDict, unravel_two, unravel_three
 
 
 class MiniBatchSequence(Sequence):
+    unravel = staticmethod(unravel_three)
 
     def __init__(
         self,
@@ -21,6 +23,7 @@ class MiniBatchSequence(Sequence):
         assert batch_size == 1
         self.n_batches = len(x)
         self.shuffle = shuffle
+        self.stateful = shuffle
         self.indices = list(range(self.n_batches))
         self.batch_size = batch_size
         self.x, self.y, self.out_weight = self.astensors(x, y, out_weight)
@@ -30,7 +33,7 @@ class MiniBatchSequence(Sequence):
 
     def __getitem__(self, index):
         idx = self.indices[index]
-        return self.x[idx], self.y[idx], self.out_weight[idx]
+        return BatchDict(self.x[idx], self.y[idx], self.out_weight[idx])
 
     def on_epoch_end(self):
         if self.shuffle:
@@ -44,6 +47,7 @@ class MiniBatchSequence(Sequence):
 
 
 class SAGEMiniBatchSequence(Sequence):
+    unravel = staticmethod(unravel_two)
 
     def __init__(
         self,
@@ -60,6 +64,7 @@ class SAGEMiniBatchSequence(Sequence):
         self.y = y
         self.n_batches = int(np.ceil(len(self.batch_nodes) / batch_size))
         self.shuffle = shuffle
+        self.stateful = shuffle
         self.batch_size = batch_size
         self.indices = np.arange(len(self.batch_nodes))
         self.num_samples = num_samples
@@ -84,7 +89,7 @@ class SAGEMiniBatchSequence(Sequence):
 
         y = self.y[idx] if self.y is not None else None
 
-        return self.astensors([self.node_attr, *nodes_input], y)
+        return BatchDict(*self.astensors([self.node_attr, *nodes_input], y))
 
     def on_epoch_end(self):
         pass
@@ -106,6 +111,7 @@ def sample_neighbors(adj_matrix, nodes, num_neighbors):
 
 
 class FastGCNBatchSequence(Sequence):
+    unravel = staticmethod(unravel_two)
 
     def __init__(
         self,
@@ -122,6 +128,7 @@ class FastGCNBatchSequence(Sequence):
         self.n_batches = int(
             np.ceil(adj_matrix.shape[0] / batch_size)) if batch_size else 1
         self.shuffle = shuffle
+        self.stateful = shuffle
         self.batch_size = batch_size
         self.indices = np.arange(adj_matrix.shape[0])
         self.rank = rank
@@ -155,7 +162,7 @@ class FastGCNBatchSequence(Sequence):
             else:
                 node_attr = node_attr[q]
 
-        return self.astensors((node_attr, adj_matrix), y)
+        return BatchDict(*self.astensors((node_attr, adj_matrix), y))
 
     def full_batch(self):
         return (self.node_attr, self.adj_matrix), self.y
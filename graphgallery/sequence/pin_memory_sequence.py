@@ -0,0 +1,59 @@
+import torch
+
+from .base_sequence import Sequence
+from .utils import BatchDict, unravel_batch
+
+
+class PinMemorySequence(Sequence):
+    """Copies the host tensors of the batches into pinned (page-locked)
+    memory, which enables asynchronous host-to-device copies
+    with `non_blocking=True`. Only for PyTorch backend.
+
+    Tensors that are already on the device are kept as they are.
+    """
+    pin_memory = True
+
+    def __init__(self, sequence, cache=False, *args, **kwargs):
+        """
+        Parameters:
+        ----------
+        sequence: `graphgallery.sequence.Sequence` or `tf.keras.utils.Sequence`.
+            The sequence whose batches would be pinned.
+        cache: bool. optional
+            Whether to pin each batch only once and cache it,
+            it should be used only if the batches never change.
+        device: the device where the batches are copied to, e.g., 'cuda'.
+        """
+        super().__init__(*args, **kwargs)
+        self.sequence = sequence
+        self.cache = {} if cache else None
+        self.unravel = getattr(sequence, "unravel", unravel_batch)
+
+    def __len__(self):
+        return len(self.sequence)
+
+    def __getitem__(self, index):
+        cache = self.cache
+        if cache is None:
+            return pin(self.sequence[index])
+        batch = cache.get(index, None)
+        if batch is None:
+            batch = cache[index] = pin(self.sequence[index])
+        return batch
+
+    @property
+    def stateful(self):
+        return getattr(self.sequence, "stateful", True)
+
+    def on_epoch_end(self):
+        self.sequence.on_epoch_end()
+
+
+def pin(x):
+    if torch.is_tensor(x):
+        return x.pin_memory() if x.device.type == "cpu" else x
+    if isinstance(x, BatchDict):
+        return BatchDict(*(pin(xi) for xi in x))
+    if isinstance(x, (list, tuple)):
+        return type(x)(pin(xi) for xi in x)
+    return x
@@ -3,9 +3,11 @@ import numpy as np
 import tensorflow as tf
 
 from .base_sequence import Sequence
+from .utils import BatchDict, unravel_three
 
 
 class SBVATSampleSequence(Sequence):
+    unravel = staticmethod(unravel_three)
 
     def __init__(
         self,
@@ -31,7 +33,7 @@ class SBVATSampleSequence(Sequence):
         return 1
 
     def __getitem__(self, index):
-        return self.astensors(*self.x, self.adv_mask), self.astensor(self.y), self.astensor(self.out_weight)
+        return BatchDict(self.astensors(*self.x, self.adv_mask), self.astensor(self.y), self.astensor(self.out_weight))
 
     def on_epoch_end(self):
         if self.resample:
@@ -0,0 +1,46 @@
+from .base_sequence import Sequence
+from .utils import unravel_batch
+
+
+class ShardedSequence(Sequence):
+    """Takes one shard of the batches of a sequence,
+    i.e., every `num_shards`-th batch starting from `index`,
+    which is used for data-parallel training.
+
+    Note:
+    -----
+    The remaining batches are dropped so that all the shards
+    have the same number of batches.
+    """
+
+    def __init__(self, sequence, num_shards, index, *args, **kwargs):
+        """
+        Parameters:
+        ----------
+        sequence: `graphgallery.sequence.Sequence` or `tf.keras.utils.Sequence`.
+            The sequence to be sharded.
+        num_shards: integer scalar.
+            The number of shards, e.g., the number of workers.
+        index: integer scalar.
+            The index of this shard, e.g., the rank of this worker.
+        """
+        kwargs.setdefault("device", getattr(sequence, "device", "cpu"))
+        super().__init__(*args, **kwargs)
+        assert 0 <= index < num_shards, (index, num_shards)
+        self.sequence = sequence
+        self.num_shards = num_shards
+        self.index = index
+        self.unravel = getattr(sequence, "unravel", unravel_batch)
+
+    def __len__(self):
+        return len(self.sequence) // self.num_shards
+
+    def __getitem__(self, index):
+        return self.sequence[index * self.num_shards + self.index]
+
+    @property
+    def stateful(self):
+        return getattr(self.sequence, "stateful", True)
+
+    def on_epoch_end(self):
+        self.sequence.on_epoch_end()
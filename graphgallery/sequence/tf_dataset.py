@@ -0,0 +1,131 @@
+import tensorflow as tf
+
+from .base_sequence import Sequence
+from .utils import BatchDict, unravel_batch
+
+
+def sequence_to_tf_dataset(sequence, device):
+    """Convert a sequence into a `tf.data.Dataset` whose elements
+    are copied to `device` and prefetched, so that the next batch
+    is already resident on the device before the step executes.
+
+    Note:
+    -----
+    This method requires TensorFlow >= 2.4.
+    The elements are dicts with keys `x`, `y` and `out_weight`,
+    where the missing (`None`) ones are dropped,
+    use `unravel_batch` to unpack them.
+    The elements are generated on the host, so it only pays off for
+    sequences that emit host tensors (`sequence.device` is CPU),
+    the batches of a sequence on `device` are not copied again.
+
+    Parameters:
+    ----------
+    sequence: `graphgallery.sequence.Sequence` or `tf.keras.utils.Sequence`.
+    device: string
+        The target TensorFlow device, e.g., 'GPU:0'.
+
+    Returns:
+    ----------
+    A `tf.data.Dataset` instance that iterates the sequence once.
+    """
+
+    # the first batch is used to infer the signature, and the first
+    # pass continues the same iteration instead of building it again
+    pending = iter(sequence)
+    first = as_element(next(pending))
+
+    def generator():
+        nonlocal pending
+        if pending is not None:
+            iterator, pending = pending, None
+            yield first
+            yield from map(as_element, iterator)
+        else:
+            yield from map(as_element, sequence)
+
+    output_signature = tf.nest.map_structure(relaxed_spec, first)
+    dataset = tf.data.Dataset.from_generator(generator,
+                                             output_signature=output_signature)
+    if is_gpu(device) and not is_gpu(getattr(sequence, "device", "CPU")):
+        dataset = dataset.apply(tf.data.experimental.copy_to_device(device))
+    # the following transformations should be placed on the target device
+    with tf.device(device):
+        dataset = dataset.prefetch(tf.data.experimental.AUTOTUNE)
+    return dataset
+
+
+def is_gpu(device):
+    return "GPU" in str(device).upper()
+
+
+def as_element(batch):
+    inputs, labels, out_weight = unravel_batch(batch)
+    if isinstance(inputs, list):
+        # lists are not acceptable structures for `tf.data`
+        inputs = tuple(inputs)
+    element = dict(x=inputs, y=labels, out_weight=out_weight)
+    return {k: v for k, v in element.items() if v is not None}
+
+
+def as_batch(element):
+    # the inverse of `as_element`, so that all the consumers
+    # see the same batch structure as the other sequences
+    return BatchDict(element["x"], element.get("y", None), element.get("out_weight", None))
+
+
+def relaxed_spec(value):
+    # shapes may vary from batch to batch
+    if isinstance(value, tf.SparseTensor):
+        return tf.SparseTensorSpec([None] * value.shape.rank, value.dtype)
+    value = tf.convert_to_tensor(value)
+    return tf.TensorSpec([None] * value.shape.rank, value.dtype)
+
+
+class CachedFullBatchSequence(Sequence):
+    """Serves the single batch of a full-batch sequence from a
+    cached and repeated `tf.data.Dataset`, so that the batch is built
+    only once instead of being re-emitted by the sequence in every epoch,
+    e.g., `FastGCNBatchSequence` converts its inputs to tensors each time.
+    It should not be used for `FullBatchSequence`, whose batch is
+    already resident on the device.
+
+    Note:
+    -----
+    The batch is fixed once it is cached, i.e., the shuffling or
+    resampling in `on_epoch_end` of the wrapped sequence no longer applies.
+    """
+    stateful = False
+
+    def __init__(self, sequence, *args, **kwargs):
+        """
+        Parameters:
+        ----------
+        sequence: `graphgallery.sequence.Sequence` or `tf.keras.utils.Sequence`.
+            The sequence to be cached, which has only one batch.
+        """
+        kwargs.setdefault("device", getattr(sequence, "device", "cpu"))
+        super().__init__(*args, **kwargs)
+        assert len(sequence) == 1, "Only full-batch sequence is supported."
+        self.sequence = sequence
+
+        dataset = tf.data.Dataset.from_tensors(as_element(sequence[0]))
+        # `take` before `cache`, otherwise the cache would never be
+        # completed and the element is read from the source every time
+        dataset = dataset.take(1).cache().repeat()
+        if is_gpu(self.device):
+            dataset = dataset.apply(tf.data.experimental.prefetch_to_device(self.device, 1))
+        else:
+            dataset = dataset.prefetch(1)
+        self.dataset = dataset
+        # keep the iterator alive across epochs
+        self.iterator = iter(dataset)
+
+    def __len__(self):
+        return 1
+
+    def __getitem__(self, index):
+        return as_batch(next(self.iterator))
+
+    def __iter__(self):
+        yield as_batch(next(self.iterator))
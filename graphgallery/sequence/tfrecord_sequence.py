@@ -0,0 +1,102 @@
+import os
+import os.path as osp
+import tensorflow as tf
+
+from graphgallery.data.io import makedirs_from_filepath
+from .base_sequence import Sequence
+from .tf_dataset import as_element, as_batch, relaxed_spec
+
+
+class TFRecordSequence(Sequence):
+    """Caches the batches of a sequence on disk.
+
+    The batches are written into a TFRecord file while iterating
+    the first epoch, and then streamed from the file in the subsequent
+    epochs, which avoids both recomputing the batches and holding
+    all of them in memory.
+
+    Note:
+    -----
+    The batches are fixed once they are cached, i.e., the shuffling or
+    resampling in `on_epoch_end` of the wrapped sequence no longer applies.
+    """
+
+    def __init__(self, sequence, path, temporary=False, *args, **kwargs):
+        """
+        Parameters:
+        ----------
+        sequence: `graphgallery.sequence.Sequence` or `tf.keras.utils.Sequence`.
+            The sequence to be cached.
+        path: string
+            The path of the TFRecord file.
+        temporary: bool. optional
+            Whether the file should be removed (see `remove`) by the trainer
+            at the end of each training, e.g., the caches of `cache_train_data='disk'`.
+        """
+        kwargs.setdefault("device", getattr(sequence, "device", "cpu"))
+        super().__init__(*args, **kwargs)
+        self.sequence = sequence
+        self.path = path
+        self.temporary = temporary
+        self.element_spec = None
+        self.dataset = None
+
+    def __len__(self):
+        return len(self.sequence)
+
+    def __getitem__(self, index):
+        return self.sequence[index]
+
+    def __iter__(self):
+        if self.dataset is None:
+            yield from self._write()
+        else:
+            yield from map(as_batch, self.dataset)
+
+    @property
+    def stateful(self):
+        # the cached batches are fixed
+        return self.dataset is None and getattr(self.sequence, "stateful", True)
+
+    def on_epoch_end(self):
+        if self.dataset is None:
+            self.sequence.on_epoch_end()
+
+    def remove(self):
+        """Remove the TFRecord file, the batches would be
+        cached again in the next pass."""
+        self.dataset = None
+        self.element_spec = None
+        if osp.exists(self.path):
+            os.remove(self.path)
+
+    def _write(self):
+        makedirs_from_filepath(self.path)
+        with tf.io.TFRecordWriter(self.path) as writer:
+            for batch in self.sequence:
+                element = as_element(batch)
+                if self.element_spec is None:
+                    self.element_spec = tf.nest.map_structure(relaxed_spec, element)
+                components = tf.nest.flatten(element, expand_composites=True)
+                components = [tf.io.serialize_tensor(c).numpy() for c in components]
+                feature = tf.train.Feature(bytes_list=tf.train.BytesList(value=components))
+                example = tf.train.Example(features=tf.train.Features(feature={"components": feature}))
+                writer.write(example.SerializeToString())
+                yield batch
+        # only switch to the file after a complete pass
+        self.dataset = self._read()
+
+    def _read(self):
+        spec = self.element_spec
+        component_specs = tf.nest.flatten(spec, expand_composites=True)
+        features = {"components": tf.io.FixedLenFeature([len(component_specs)], tf.string)}
+
+        def parse_fn(record):
+            serialized = tf.io.parse_single_example(record, features)["components"]
+            components = [tf.ensure_shape(tf.io.parse_tensor(serialized[i], s.dtype), s.shape)
+                          for i, s in enumerate(component_specs)]
+            return tf.nest.pack_sequence_as(spec, components, expand_composites=True)
+
+        dataset = tf.data.TFRecordDataset(self.path)
+        dataset = dataset.map(parse_fn, num_parallel_calls=tf.data.experimental.AUTOTUNE)
+        return dataset.prefetch(tf.data.experimental.AUTOTUNE)
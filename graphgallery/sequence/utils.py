@@ -0,0 +1,109 @@
+import queue
+import threading
+from collections import namedtuple
+
+# the batch emitted by the sequences, which is still a tuple
+# `(x, y, out_weight)` but with cheap attribute access
+BatchDict = namedtuple("BatchDict", ["x", "y", "out_weight"])
+# `defaults` of namedtuple requires Python>=3.7
+BatchDict.__new__.__defaults__ = (None, None)
+
+
+def unravel_batch(batch):
+    if isinstance(batch, BatchDict):
+        return batch.x, batch.y, batch.out_weight
+
+    inputs = labels = out_weight = None
+    if isinstance(batch, dict):
+        # elements of `tf.data.Dataset`, see `sequence_to_tf_dataset`
+        inputs = batch["x"]
+        labels = batch.get("y", None)
+        out_weight = batch.get("out_weight", None)
+    elif isinstance(batch, (list, tuple)):
+        inputs = batch[0]
+        labels = batch[1]
+        if len(batch) > 2:
+            out_weight = batch[-1]
+    else:
+        inputs = batch
+    return inputs, labels, out_weight
+
+
+# specialized versions of `unravel_batch`,
+# for sequences whose batches have a fixed structure
+def unravel_one(batch):
+    return batch, None, None
+
+
+def unravel_two(batch):
+    return batch[0], batch[1], None
+
+
+def unravel_three(batch):
+    return batch[0], batch[1], batch[2]
+
+
+class PrefetchIterator:
+    """Iterates over a sequence in a background thread.
+
+    The batches are unraveled into `(inputs, labels, out_weight)`
+    and put into a bounded queue, so that the next batch is assembled
+    while the current one is consumed.
+
+    Example
+    -------
+    >>> for inputs, labels, out_weight in PrefetchIterator(sequence):
+    ...     model.train_step_on_batch(inputs, labels, out_weight)
+    """
+
+    def __init__(self, sequence, depth=2):
+        """
+        Parameters:
+        ----------
+        sequence: an iterable object, e.g., `graphgallery.sequence.Sequence`.
+        depth: integer scalar. optional
+            The maximum number of batches prepared in advance.
+        """
+        self.sequence = sequence
+        self.unravel = getattr(sequence, "unravel", unravel_batch)
+        self.queue = queue.Queue(maxsize=depth)
+        self.exception = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        # give up when the consumer has stopped,
+        # otherwise the worker may block forever
+        while not self._stop.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _worker(self):
+        unravel = self.unravel
+        try:
+            for batch in self.sequence:
+                if not self._put(unravel(batch)):
+                    return
+        except Exception as e:
+            self.exception = e
+        finally:
+            # `None` marks the end of the sequence
+            self._put(None)
+
+    def __iter__(self):
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                yield item
+            if self.exception is not None:
+                raise self.exception
+        finally:
+            self._stop.set()
+            self._thread.join()
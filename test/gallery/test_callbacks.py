@@ -0,0 +1,128 @@
+import os.path as osp
+import numpy as np
+import tensorflow as tf
+from types import SimpleNamespace
+
+from graphgallery.gallery.default import default_cfg
+from graphgallery.gallery.trainer import setup_callbacks
+from graphgallery.gallery.callbacks import NoOpCallbacks, FastCallbackList, has_weights
+
+
+def build_model():
+    return tf.keras.Sequential([tf.keras.layers.Dense(1, input_shape=(1,))])
+
+
+def train_cfg():
+    trainer = SimpleNamespace(name="Trainer", seed=None, device="cpu", backend=None,
+                              intx="int32", floatx="float32", boolx="bool")
+    cfg = default_cfg(trainer).train
+    cfg.ModelCheckpoint.enabled = False
+    return cfg
+
+
+def run(callbacks, model, values, monitor="val_loss"):
+    # the weights are set to the epoch number, so that
+    # the restored weights tell which epoch they come from
+    callbacks.set_model(model)
+    model.stop_training = False
+    callbacks.on_train_begin()
+    stopped_epoch = None
+    for epoch, value in enumerate(values):
+        model.set_weights([np.full(w.shape, epoch, dtype=w.dtype) for w in model.get_weights()])
+        callbacks.on_epoch_end(epoch, {monitor: value})
+        if model.stop_training:
+            stopped_epoch = epoch
+            break
+    callbacks.on_train_end()
+    return stopped_epoch, model.get_weights()[0].item()
+
+
+def test_early_stopping():
+    for values, patience, baseline in [([5, 4, 3, 3.5, 3.2, 3.1, 3], 2, None),
+                                       ([5, 4, 3, 3.5, 3.2, 3.1, 3], 3, None),
+                                       ([3, 2, 1, 0.5], 2, None),
+                                       ([5, 5, 5, 5], 2, 4.),
+                                       ([5, 3.9, 4, 4, 4], 2, 4.),
+                                       ([5, 4.8, 4.6, 4.4, 4.2, 3.9], 2, 4.)]:
+        keras_callbacks = tf.keras.callbacks.CallbackList([
+            tf.keras.callbacks.History(),
+            tf.keras.callbacks.EarlyStopping(monitor="val_loss",
+                                             patience=patience,
+                                             baseline=baseline,
+                                             restore_best_weights=True)])
+        expected = run(keras_callbacks, build_model(), values)
+
+        cfg = train_cfg()
+        cfg.EarlyStopping.enabled = True
+        cfg.EarlyStopping.verbose = 0
+        cfg.EarlyStopping.patience = patience
+        cfg.EarlyStopping.baseline = baseline
+        _, callbacks = setup_callbacks(cfg, tf.keras.callbacks.History(), validation=True)
+        # `baseline` is left to Keras
+        assert isinstance(callbacks, FastCallbackList) == (baseline is None)
+        assert run(callbacks, build_model(), values) == expected, (values, patience, baseline)
+
+
+def test_checkpoint_on_disk(tmp_path):
+    values = [0.5, 0.7, 0.6, 0.8, 0.75]
+    cfg = train_cfg().ModelCheckpoint
+    cfg.enabled = True
+    cfg.in_memory = False
+    cfg.remove_weights = False
+    cfg.path = str(tmp_path / "model.h5")
+    callbacks = FastCallbackList(tf.keras.callbacks.History(), ckpt_cfg=cfg)
+    model = build_model()
+    run(callbacks, model, values, "val_accuracy")
+
+    keras_path = str(tmp_path / "keras_model.h5")
+    keras_callbacks = tf.keras.callbacks.CallbackList([
+        tf.keras.callbacks.ModelCheckpoint(keras_path,
+                                           monitor="val_accuracy",
+                                           save_best_only=True,
+                                           save_weights_only=True)])
+    keras_model = build_model()
+    run(keras_callbacks, keras_model, values, "val_accuracy")
+
+    model.load_weights(cfg.path)
+    keras_model.load_weights(keras_path)
+    assert model.get_weights()[0].item() == keras_model.get_weights()[0].item() == 3.
+
+
+def test_in_memory_checkpoint(tmp_path):
+    values = [0.5, 0.7, 0.6, 0.8, 0.75]
+    cfg = train_cfg()
+    ckpt_cfg = cfg.ModelCheckpoint
+    ckpt_cfg.enabled = True
+    ckpt_cfg.path = str(tmp_path / "model")
+    _, callbacks = setup_callbacks(cfg, tf.keras.callbacks.History(), validation=True)
+    assert run(callbacks, build_model(), values, "val_accuracy") == (None, 3.)
+    assert not list(tmp_path.iterdir())
+
+    # the checkpoint is saved into `path` to keep it
+    ckpt_cfg.remove_weights = False
+    _, callbacks = setup_callbacks(cfg, tf.keras.callbacks.History(), validation=True)
+    run(callbacks, build_model(), values, "val_accuracy")
+    assert osp.isfile(ckpt_cfg.path)
+
+
+def test_noop_callbacks():
+    history = tf.keras.callbacks.History()
+    _, callbacks = setup_callbacks(train_cfg(), history, validation=True)
+    assert type(callbacks) is NoOpCallbacks
+    assert run(callbacks, build_model(), [3, 2, 1]) == (None, 2.)
+    assert history.history == {"val_loss": [3, 2, 1]}
+    assert history.epoch == [0, 1, 2]
+
+
+def test_has_weights():
+    # the weights are built on the first call
+    model = tf.keras.Sequential([tf.keras.layers.Dense(1)])
+    assert not has_weights(model)
+    model(tf.ones((1, 1)))
+    assert has_weights(model)
+    assert has_weights(build_model())
+
+
+if __name__ == "__main__":
+    test_early_stopping()
+    test_noop_callbacks()
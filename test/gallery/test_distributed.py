@@ -0,0 +1,113 @@
+import sys
+import types
+import pytest
+import tensorflow as tf
+from types import SimpleNamespace
+
+from graphgallery.gallery.default import default_cfg
+from graphgallery.gallery.distributed import (init_horovod, distribute_model,
+                                              broadcast_variables, worker_cfg)
+
+
+class FakeHorovod(types.ModuleType):
+    """Records the calls instead of communicating with other workers."""
+
+    def __init__(self, name, calls):
+        super().__init__(name)
+        self.calls = calls
+
+    def init(self):
+        self.calls.append("init")
+
+    def rank(self):
+        return 1
+
+    def size(self):
+        return 2
+
+    def DistributedOptimizer(self, optimizer, named_parameters=None):
+        self.calls.append(("DistributedOptimizer", optimizer))
+        return ("distributed", optimizer)
+
+    def DistributedGradientTape(self, tape):
+        self.calls.append(("DistributedGradientTape", tape))
+        return tape
+
+    def broadcast_variables(self, variables, root_rank):
+        self.calls.append(("broadcast_variables", list(variables), root_rank))
+
+    def broadcast_parameters(self, params, root_rank):
+        self.calls.append(("broadcast_parameters", params, root_rank))
+
+    def broadcast_optimizer_state(self, optimizer, root_rank):
+        self.calls.append(("broadcast_optimizer_state", optimizer, root_rank))
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+    modules = {name: FakeHorovod(name, calls) for name in
+               ["horovod", "horovod.tensorflow", "horovod.tensorflow.keras", "horovod.torch"]}
+    for name, module in modules.items():
+        monkeypatch.setitem(sys.modules, name, module)
+        parent, _, child = name.rpartition(".")
+        if parent:
+            monkeypatch.setattr(modules[parent], child, module, raising=False)
+    return calls
+
+
+def test_distribute_model(calls):
+    assert init_horovod("tensorflow").rank() == 1
+
+    model = SimpleNamespace(optimizer="optimizer")
+    distribute_model(model, "tensorflow")
+    # the gradients are averaged by the tape instead of the optimizer
+    assert model.optimizer == "optimizer"
+    assert model._tape_wrapper == sys.modules["horovod.tensorflow"].DistributedGradientTape
+
+    model = SimpleNamespace(optimizer="optimizer", named_parameters=lambda: [])
+    distribute_model(model, "torch")
+    assert model.optimizer == ("distributed", "optimizer")
+
+
+def test_broadcast_variables(calls):
+    model = SimpleNamespace(variables=["w", "b"],
+                            optimizer=SimpleNamespace(variables=lambda: ["iter"]))
+    broadcast_variables(model, "tensorflow")
+    assert calls == [("broadcast_variables", ["w", "b"], 0),
+                     ("broadcast_variables", ["iter"], 0)]
+
+    calls.clear()
+    model = SimpleNamespace(state_dict=lambda: {"w": 1}, optimizer="optimizer")
+    broadcast_variables(model, "torch", root_rank=1)
+    assert calls == [("broadcast_parameters", {"w": 1}, 1),
+                     ("broadcast_optimizer_state", "optimizer", 1)]
+
+
+def test_distributed_gradient_tape(calls):
+    from graphgallery.nn.models import TFKeras
+    x = tf.keras.Input(shape=(2,))
+    model = TFKeras(x, tf.keras.layers.Dense(2)(x))
+    model.compile(loss=tf.keras.losses.SparseCategoricalCrossentropy(from_logits=True),
+                  optimizer=tf.keras.optimizers.SGD(), metrics=["accuracy"])
+    distribute_model(model, "tensorflow")
+    model.train_step_on_batch(tf.ones((3, 2)), tf.constant([0, 1, 0]))
+    assert [call[0] for call in calls if isinstance(call, tuple)] == ["DistributedGradientTape"]
+
+
+def test_worker_cfg():
+    trainer = SimpleNamespace(name="Trainer", seed=None, device="cpu", backend=None,
+                              intx="int32", floatx="float32", boolx="bool")
+    cfg = default_cfg(trainer).train
+    cfg.TensorBoard.enabled = True
+
+    worker = worker_cfg(cfg, in_memory=True)
+    assert worker.verbose == 0 and worker.EarlyStopping.verbose == 0
+    assert not worker.TensorBoard.enabled
+    # the best weights in memory are restored on every worker
+    assert worker.ModelCheckpoint.enabled
+    # only the root worker writes checkpoints on disk
+    assert not worker_cfg(cfg, in_memory=False).ModelCheckpoint.enabled
+
+    # the shared `cfg` is left intact
+    assert cfg.verbose == 1 and cfg.TensorBoard.enabled and cfg.ModelCheckpoint.enabled
@@ -0,0 +1,58 @@
+import pytest
+import numpy as np
+from types import SimpleNamespace
+
+import graphgallery as gg
+from graphgallery.gallery.trainer import Trainer, remove_extra_tf_files
+
+
+def test_remove_extra_tf_files(tmp_path):
+    filepath = str(tmp_path / "model_checkpoint")
+    names = ["model_checkpoint.data-00000-of-00002",
+             "model_checkpoint.data-00001-of-00002",
+             "model_checkpoint.index",
+             "checkpoint"]
+    for name in names + ["model_checkpoint", "other.index"]:
+        (tmp_path / name).write_text("")
+
+    remove_extra_tf_files(filepath)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["model_checkpoint", "other.index"]
+    # nothing to remove
+    remove_extra_tf_files(filepath)
+
+
+class ListSequence(list):
+    device = "cpu"
+
+
+def predict(batch_sizes, num_samples, backend="tensorflow", logits_dtype=None):
+    model = SimpleNamespace(predict_step_on_batch=lambda x, **kwargs: np.stack([x] * 2, axis=1))
+    cfg = gg.CfgNode(dict(predict=dict(return_logits=True, fused_softmax=True,
+                                       logits_dtype=logits_dtype)))
+    trainer = SimpleNamespace(model=model, cfg=cfg, backend=backend)
+
+    offsets = np.cumsum([0] + batch_sizes)
+    sequence = ListSequence((np.arange(start, end, dtype="float32"), None)
+                            for start, end in zip(offsets[:-1], offsets[1:]))
+    return Trainer.predict_step(trainer, sequence, num_samples), offsets[-1]
+
+
+def test_predict_step():
+    for batch_sizes in [[5], [3, 4, 1], [1] * 9, [2, 0, 7]]:
+        # unknown, exact, too small and too large sizes
+        for num_samples in [None, sum(batch_sizes), 1, 100]:
+            logits, total = predict(batch_sizes, num_samples)
+            expected = np.stack([np.arange(total, dtype="float32")] * 2, axis=1)
+            np.testing.assert_array_equal(logits, expected)
+            assert logits.dtype == np.float32
+            # no view of an oversized buffer is returned
+            assert logits.base is None or logits.base.shape[0] == total
+
+
+def test_predict_step_bfloat16():
+    with pytest.raises(ValueError):
+        predict([5], None, backend="torch", logits_dtype="bfloat16")
+
+
+if __name__ == "__main__":
+    test_predict_step()
@@ -0,0 +1,17 @@
+from graphgallery.sequence import ShardedSequence
+
+
+def test_sharded_sequence():
+    batches = [(i, i + 1) for i in range(10)]
+    shards = [ShardedSequence(batches, 3, index) for index in range(3)]
+    # the remaining batch (9) is dropped
+    assert [len(shard) for shard in shards] == [3, 3, 3]
+    assert [[x for x, y in shard] for shard in shards] == [[0, 3, 6], [1, 4, 7], [2, 5, 8]]
+
+    shard = ShardedSequence(batches[:2], 3, 2)
+    assert len(shard) == 0
+    assert list(shard) == []
+
+
+if __name__ == "__main__":
+    test_sharded_sequence()
@@ -0,0 +1,50 @@
+import os.path as osp
+import numpy as np
+import tensorflow as tf
+
+from graphgallery.sequence import BatchDict, TFRecordSequence
+
+
+def build_batches():
+    batches = []
+    for i in range(3):
+        adj = tf.SparseTensor(indices=[[0, 1], [1, 0], [2, 2]],
+                              values=[1. + i, 2., 3.],
+                              dense_shape=[3, 3])
+        x = tf.constant(np.arange(6).reshape(3, 2) + i, dtype=tf.float32)
+        y = tf.constant([0, 1, 2], dtype=tf.int64)
+        batches.append(BatchDict((x, adj), y))
+    return batches
+
+
+def assert_batches_equal(outputs, batches):
+    assert len(outputs) == len(batches)
+    for output, batch in zip(outputs, batches):
+        (x, adj), y = output.x, output.y
+        assert isinstance(adj, tf.SparseTensor)
+        np.testing.assert_array_equal(x.numpy(), batch.x[0].numpy())
+        np.testing.assert_array_equal(tf.sparse.to_dense(adj).numpy(),
+                                      tf.sparse.to_dense(batch.x[1]).numpy())
+        np.testing.assert_array_equal(y.numpy(), batch.y.numpy())
+
+
+def test_tfrecord_sequence(tmp_path):
+    batches = build_batches()
+    path = str(tmp_path / "cache" / "train.tfrecord")
+    sequence = TFRecordSequence(batches, path, temporary=True)
+    assert len(sequence) == len(batches)
+
+    # written in the first pass
+    assert_batches_equal(list(sequence), batches)
+    assert osp.exists(path)
+    assert not sequence.stateful
+
+    # read back from the file
+    assert_batches_equal(list(sequence), batches)
+
+    sequence.remove()
+    assert not osp.exists(path)
+    # cached again in the next pass
+    assert_batches_equal(list(sequence), batches)
+    assert osp.exists(path)
+    sequence.remove()
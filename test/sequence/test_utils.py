@@ -0,0 +1,49 @@
+import pytest
+
+from graphgallery.sequence import BatchDict, unravel_batch, PrefetchIterator
+
+
+def test_unravel_batch():
+    assert unravel_batch(BatchDict(1, 2, 3)) == (1, 2, 3)
+    assert unravel_batch(BatchDict(1)) == (1, None, None)
+    assert unravel_batch((1, 2)) == (1, 2, None)
+    assert unravel_batch([1, 2, 3]) == (1, 2, 3)
+    assert unravel_batch(dict(x=1, y=2)) == (1, 2, None)
+    assert unravel_batch(1) == (1, None, None)
+
+    x, y, out_weight = BatchDict(1, 2)
+    assert (x, y, out_weight) == (1, 2, None)
+
+
+def test_prefetch_iterator():
+    batches = [(i, i + 1, i + 2) for i in range(10)]
+    assert list(PrefetchIterator(batches, depth=2)) == batches
+    assert list(PrefetchIterator([], depth=2)) == []
+
+
+def test_prefetch_iterator_exception():
+    def sequence():
+        yield 0, 1
+        raise ValueError("broken batch")
+
+    iterator = PrefetchIterator(sequence(), depth=2)
+    outputs = []
+    with pytest.raises(ValueError, match="broken batch"):
+        for batch in iterator:
+            outputs.append(batch)
+    assert outputs == [(0, 1, None)]
+    assert not iterator._thread.is_alive()
+
+
+def test_prefetch_iterator_early_exit():
+    # the worker is blocked by the full queue when the consumer stops
+    iterator = PrefetchIterator(((i, i) for i in range(1000)), depth=1)
+    batches = iter(iterator)
+    assert next(batches) == (0, 0, None)
+    batches.close()
+    assert not iterator._thread.is_alive()
+
+
+if __name__ == "__main__":
+    test_unravel_batch()
+    test_prefetch_iterator()